@@ -5,6 +5,7 @@ Wraps the FastAPI app from backend/ so Vercel can serve it
 as a single catch-all Python serverless function at /api/*.
 """
 
+import logging
 import sys
 import os
 
@@ -12,3 +13,21 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
 
 from main import app  # noqa: E402
+from models import SearchRequest  # noqa: E402
+from ai_service import generate_mock_response  # noqa: E402
+
+
+def _warm() -> None:
+    """Run one mock search at boot so the first real request doesn't pay for
+    building the mock product list on a cold start.
+
+    The query names a category outright, so it reaches the product path
+    rather than stopping at a follow-up question.
+    """
+    try:
+        generate_mock_response(SearchRequest(query="monitor"))
+    except Exception:
+        logging.getLogger("cliq.api").exception("Warm-up search failed")
+
+
+_warm()
@@ -1,13 +1,27 @@
 import os
 import json
-from typing import Optional
-
+import logging
+import asyncio
+import time
+import hashlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+import httpx
 from openai import AsyncOpenAI
+from pydantic import BaseModel, ValidationError, field_validator
+from pydantic_core import from_json
 
 from models import (
     SearchRequest, SearchResponse, Product, ShoppingIntent,
-    FollowUpQuestion, LearnedPreferences,
+    FollowUpQuestion, LearnedPreferences, UserProfile,
 )
+from mock_data import get_mock_products
+from cache import LRUCache, SingleFlight
+
+logger = logging.getLogger("cliq.ai_service")
 
 # =============================================
 # OPENROUTER API INTEGRATION
@@ -15,14 +29,60 @@ from models import (
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 OPENROUTER_MODEL = "google/gemini-2.0-flash-lite-001"
 
+# Fail over to the mock quickly when OpenRouter is slow instead of letting
+# requests pile up: per-attempt SDK timeout, overall deadline (SDK retries
+# included) and a cap on completions in flight per process.
+OPENROUTER_REQUEST_TIMEOUT = 8.0
+OPENROUTER_DEADLINE = 10.0
+OPENROUTER_MAX_CONCURRENCY = 64
+_openrouter_slots = asyncio.Semaphore(OPENROUTER_MAX_CONCURRENCY)
+
 client: Optional[AsyncOpenAI] = None
 if OPENROUTER_API_KEY:
     client = AsyncOpenAI(
         base_url="https://openrouter.ai/api/v1",
         api_key=OPENROUTER_API_KEY,
+        # Built once per process so warm serverless invocations reuse the pool.
+        # HTTP/2 multiplexes concurrent completions over one TLS connection;
+        # the transport retries failed connects, the SDK itself retries 429s.
+        http_client=httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=200),
+                retries=2,
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        ),
     )
 
 
+async def close_client() -> None:
+    """Close the OpenRouter client's connection pool. Call on app shutdown."""
+    global client
+    if client is not None:
+        await client.close()
+        client = None
+
+
+# Number of trailing conversation messages replayed to the model. Only the
+# newest HISTORY_VERBATIM go in word for word; the rest are clipped to a
+# one-line "Earlier context" recap to keep the prompt (and prefill) short.
+HISTORY_WINDOW = 10
+HISTORY_VERBATIM = 3
+HISTORY_RECAP_CHARS = 80
+
+# Response cache — shopping queries repeat a lot, so identical
+# (query, profile, recent conversation) triples skip the LLM round-trip.
+RESPONSE_CACHE_TTL = 5 * 60  # short enough that prices and stock stay current
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# cache_key -> (expires_at, serialized SearchResponse)
+_response_cache: LRUCache[str, tuple[float, str]] = LRUCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+# cache_key -> completion in flight, shared by concurrent identical requests
+_inflight: SingleFlight[str, SearchResponse] = SingleFlight()
+
+
 SYSTEM_PROMPT = """You are Cliq, an expert AI shopping assistant that THINKS before recommending.
 
 ## YOUR PERSONALITY
@@ -103,6 +163,163 @@ You MUST respond with valid JSON only (no markdown, no code blocks):
   "learned_preferences": {}
 }"""
 
+# Built once so every request sends a byte-identical prefix; the cache_control
+# breakpoint lets OpenRouter reuse the provider-side prompt cache for it.
+SYSTEM_MSG = {
+    "role": "system",
+    "content": [
+        {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+    ],
+}
+
+
+def _response_cache_key(request: SearchRequest) -> str:
+    """Hash the normalized query, the user profile and the replayed conversation tail."""
+    key = hashlib.blake2b(digest_size=16)
+    key.update(" ".join(request.query.lower().split()).encode())
+    key.update(b"|")
+    if request.user_profile:
+        key.update(request.user_profile.model_dump_json().encode())
+    key.update(b"|")
+    history = request.conversation_history[-HISTORY_WINDOW:]
+    key.update(json.dumps(history, sort_keys=True, default=str).encode())
+    return key.hexdigest()
+
+
+def _get_cached_response(key: str) -> Optional[SearchResponse]:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, payload = entry
+    if expires_at < time.monotonic():
+        _response_cache.pop(key)
+        return None
+    # Rebuild from JSON so callers can't mutate the cached copy
+    return SearchResponse.model_validate_json(payload)
+
+
+def _cache_response(key: str, response: SearchResponse) -> None:
+    _response_cache.put(key, (time.monotonic() + RESPONSE_CACHE_TTL, response.model_dump_json()))
+
+
+# Optional profile lines — (label, getter), emitted only when the value is set
+_PROFILE_FIELDS = tuple((label, attrgetter(path)) for label, path in (
+    ("Preferred brands", "preferred_brands"),
+    ("Gender", "learned.gender"),
+    ("Age range", "learned.age_range"),
+    ("Style", "learned.style"),
+    ("Interests", "learned.interests"),
+    ("Sizes", "learned.sizes"),
+    ("Dislikes", "learned.dislikes"),
+    ("Known use-cases", "learned.use_cases"),
+    ("Favorite colors", "learned.favorite_colors"),
+    ("Climate", "learned.climate"),
+))
+
+
+def _format_profile_value(value: Any) -> str:
+    if isinstance(value, dict):
+        return ", ".join(f"{k}: {v}" for k, v in value.items())
+    if isinstance(value, list):
+        return ", ".join(value)
+    return str(value)
+
+
+def _profile_context(profile: UserProfile) -> str:
+    """Render the user's profile as the "User profile:" block of the prompt."""
+    optional = "".join(
+        f"- {label}: {_format_profile_value(value)}\n"
+        for label, get in _PROFILE_FIELDS
+        if (value := get(profile))
+    )
+    return (
+        "User profile:\n"
+        f"- Price sensitivity: {profile.price_sensitivity.value}\n"
+        f"- Shipping preference: {profile.shipping_preference.value}\n"
+        f"{optional}"
+    )
+
+
+def _clip(text: str, limit: int = HISTORY_RECAP_CHARS) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _conversation_context(history: list[dict]) -> str:
+    """Render the conversation tail: a compact recap of older turns, then the latest verbatim."""
+    if not history:
+        return ""
+    window = history[-HISTORY_WINDOW:]
+    earlier, recent = window[:-HISTORY_VERBATIM], window[-HISTORY_VERBATIM:]
+
+    lines = ["\nConversation so far:"]
+    if earlier:
+        recap = " | ".join(
+            f"{msg.get('role', 'user')}: {_clip(str(msg.get('content', '')))}" for msg in earlier
+        )
+        lines.append(f"Earlier context: {recap}")
+    lines.extend(f"- {msg.get('role', 'user')}: {msg.get('content', '')}" for msg in recent)
+    return "\n".join(lines) + "\n"
+
+
+def _build_user_message(request: SearchRequest) -> str:
+    """Render the user's profile, recent conversation and query into the prompt."""
+    user_context = _profile_context(request.user_profile) if request.user_profile else ""
+
+    return f"""{user_context}
+{_conversation_context(request.conversation_history)}
+User's latest message: "{request.query}"
+"""
+
+
+def _build_messages(request: SearchRequest) -> list[dict]:
+    return [
+        SYSTEM_MSG,
+        {"role": "user", "content": _build_user_message(request)},
+    ]
+
+
+class _LLMReply(BaseModel):
+    """The model's JSON reply, validated in one pass straight from the raw text."""
+    agent_message: str = "Here are some recommendations for you."
+    thinking: Optional[str] = None
+    intent: Optional[ShoppingIntent] = None
+    products: List[Product] = []
+    follow_up_question: Optional[FollowUpQuestion] = None
+    learned_preferences: Optional[LearnedPreferences] = None
+
+    @field_validator("intent", "follow_up_question", mode="before")
+    @classmethod
+    def _empty_as_none(cls, value):
+        return value or None
+
+    @field_validator("learned_preferences", mode="wrap")
+    @classmethod
+    def _ignore_bad_preferences(cls, value, handler):
+        # A malformed learned_preferences block shouldn't discard the products
+        if not value:
+            return None
+        try:
+            return handler(value)
+        except ValidationError:
+            return None
+
+
+def _parse_llm_response(raw_content: str) -> SearchResponse:
+    """Turn the model's JSON reply into a SearchResponse (raises on malformed output)."""
+    response_text = raw_content.strip()
+
+    # Clean up markdown code blocks if present
+    if response_text.startswith("```"):
+        lines = response_text.split("\n")
+        response_text = "\n".join(lines[1:])
+        if response_text.endswith("```"):
+            response_text = response_text[:-3].strip()
+
+    reply = _LLMReply.model_validate_json(response_text)
+    # Fields are already validated — assemble without a second validation pass
+    return SearchResponse.model_construct(**dict(reply))
+
 
 async def interpret_query_with_gemini(request: SearchRequest) -> SearchResponse:
     """
@@ -112,135 +329,280 @@ async def interpret_query_with_gemini(request: SearchRequest) -> SearchResponse:
     if client is None:
         return generate_mock_response(request)
 
+    cache_key = _response_cache_key(request)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+
+    # Coalesce identical concurrent searches onto a single completion
+    result = await _inflight.run(cache_key, lambda: _complete(request, cache_key))
+    return result.model_copy(deep=True)
+
+
+@asynccontextmanager
+async def _openrouter_completion(**kwargs) -> AsyncIterator[Any]:
+    """Create a completion while holding one of the in-flight slots.
+
+    OPENROUTER_DEADLINE covers the whole block: waiting for a slot, the
+    request, and the caller's body, so a saturated process fails over to the
+    mock instead of queueing and a slow stream can't hold its slot while
+    it is drained. Overrunning raises TimeoutError.
+    """
+    deadline = asyncio.get_running_loop().time() + OPENROUTER_DEADLINE
+    async with asyncio.timeout_at(deadline):
+        await _openrouter_slots.acquire()
     try:
-        # Build rich user context from profile
-        user_context_parts = []
-        if request.user_profile:
-            p = request.user_profile
-            user_context_parts.append(f"Price sensitivity: {p.price_sensitivity.value}")
-            user_context_parts.append(f"Shipping preference: {p.shipping_preference.value}")
-            if p.preferred_brands:
-                user_context_parts.append(f"Preferred brands: {', '.join(p.preferred_brands)}")
-
-            # Include learned preferences
-            lp = p.learned
-            if lp.gender:
-                user_context_parts.append(f"Gender: {lp.gender}")
-            if lp.age_range:
-                user_context_parts.append(f"Age range: {lp.age_range}")
-            if lp.style:
-                user_context_parts.append(f"Style: {lp.style}")
-            if lp.interests:
-                user_context_parts.append(f"Interests: {', '.join(lp.interests)}")
-            if lp.sizes:
-                sizes_str = ", ".join(f"{k}: {v}" for k, v in lp.sizes.items())
-                user_context_parts.append(f"Sizes: {sizes_str}")
-            if lp.dislikes:
-                user_context_parts.append(f"Dislikes: {', '.join(lp.dislikes)}")
-            if lp.use_cases:
-                user_context_parts.append(f"Known use-cases: {', '.join(lp.use_cases)}")
-            if lp.favorite_colors:
-                user_context_parts.append(f"Favorite colors: {', '.join(lp.favorite_colors)}")
-            if lp.climate:
-                user_context_parts.append(f"Climate: {lp.climate}")
-
-        user_context = ""
-        if user_context_parts:
-            user_context = "User profile:\n" + "\n".join(f"- {x}" for x in user_context_parts) + "\n"
-
-        conversation_context = ""
-        if request.conversation_history:
-            conversation_context = "\nConversation so far:\n"
-            for msg in request.conversation_history[-10:]:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                conversation_context += f"- {role}: {content}\n"
-
-        user_message = f"""{user_context}
-{conversation_context}
-User's latest message: "{request.query}"
-"""
+        async with asyncio.timeout_at(deadline):
+            response = await client.chat.completions.create(
+                model=OPENROUTER_MODEL,
+                temperature=0.7,
+                timeout=OPENROUTER_REQUEST_TIMEOUT,
+                **kwargs,
+            )
+            yield response
+    finally:
+        _openrouter_slots.release()
 
-        response = await client.chat.completions.create(
-            model=OPENROUTER_MODEL,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_message},
-            ],
-            temperature=0.7,
-        )
 
-        raw_content = response.choices[0].message.content
+async def _complete(request: SearchRequest, cache_key: str) -> SearchResponse:
+    raw_content = None
+    try:
+        async with _openrouter_completion(messages=_build_messages(request)) as response:
+            raw_content = response.choices[0].message.content
         if not raw_content:
             return generate_mock_response(request)
-        response_text = raw_content.strip()
-
-        # Clean up markdown code blocks if present
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            response_text = "\n".join(lines[1:])
-            if response_text.endswith("```"):
-                response_text = response_text[:-3].strip()
-
-        data = json.loads(response_text)
-
-        # Extract learned preferences
-        learned = None
-        if data.get("learned_preferences"):
-            try:
-                learned = LearnedPreferences(**data["learned_preferences"])
-            except Exception:
-                learned = None
-
-        return SearchResponse(
-            agent_message=data.get("agent_message", "Here are some recommendations for you."),
-            thinking=data.get("thinking"),
-            intent=ShoppingIntent(**data["intent"]) if data.get("intent") else None,
-            products=[Product(**p) for p in data.get("products", [])],
-            follow_up_question=(
-                FollowUpQuestion(**data["follow_up_question"])
-                if data.get("follow_up_question")
-                else None
-            ),
-            learned_preferences=learned,
-        )
-    except Exception as e:
-        print(f"OpenRouter API error: {e}")
+
+        result = _parse_llm_response(raw_content)
+        _cache_response(cache_key, result)
+        return result
+    except asyncio.TimeoutError:
+        logger.warning("OpenRouter timed out after %ss, serving mock results", OPENROUTER_DEADLINE)
         return generate_mock_response(request)
+    except Exception:
+        logger.exception("OpenRouter API error (reply starts: %.200s)", raw_content)
+        return generate_mock_response(request)
+
+
+def _response_events(response: SearchResponse) -> Iterator[tuple[str, Any]]:
+    """Replay an already-complete response as stream events."""
+    yield "message", {"agent_message": response.agent_message}
+    for product in response.products:
+        yield "product", product
+    yield "result", response
+
+
+def _parse_partial_json(text: str) -> Optional[dict]:
+    """Parse as much of an incomplete JSON object as has arrived so far.
+
+    Unterminated strings are dropped, so any string value present is final.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    try:
+        data = from_json(text[start:], allow_partial=True)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def stream_query_with_gemini(request: SearchRequest) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Streaming variant of interpret_query_with_gemini.
+
+    Yields ("message", {"agent_message": ...}) as soon as the agent message is
+    complete, ("product", Product) as each product finishes, and finally
+    ("result", SearchResponse) with the full parsed response. Falls back to
+    mock data the same way the buffered path does; if the completion fails
+    after events went out, ("reset", {}) is sent first so clients discard
+    them before the mock response is streamed in full.
+    """
+    if client is None:
+        for event in _response_events(generate_mock_response(request)):
+            yield event
+        return
+
+    cache_key = _response_cache_key(request)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        for event in _response_events(cached):
+            yield event
+        return
+
+    buffer = ""
+    sent_message = False
+    sent_products = 0
+    emitted = False  # whether any event from this completion reached the client
+    try:
+        # The slot is held until the stream is drained
+        async with _openrouter_completion(
+            messages=_build_messages(request),
+            response_format={"type": "json_object"},
+            stream=True,
+        ) as stream:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                buffer += chunk.choices[0].delta.content
+
+                partial = _parse_partial_json(buffer)
+                if partial is None:
+                    continue
+                if not sent_message and "agent_message" in partial:
+                    sent_message = emitted = True
+                    yield "message", {"agent_message": partial["agent_message"]}
+                # The last product may still be streaming; the ones before it are done
+                products = partial.get("products") or []
+                while sent_products < len(products) - 1:
+                    try:
+                        product = Product.model_validate(products[sent_products])
+                    except Exception:
+                        product = None
+                    sent_products += 1
+                    if product is not None:
+                        emitted = True
+                        yield "product", product
+
+        result = _parse_llm_response(buffer) if buffer else generate_mock_response(request)
+        if buffer:
+            _cache_response(cache_key, result)
+    except asyncio.TimeoutError:
+        logger.warning("OpenRouter timed out after %ss, serving mock results", OPENROUTER_DEADLINE)
+        result = None
+    except Exception:
+        logger.exception("OpenRouter API error (reply starts: %.200s)", buffer)
+        result = None
+
+    if result is None:
+        # The mock replaces whatever the failed completion already streamed
+        if emitted:
+            yield "reset", {}
+        for event in _response_events(generate_mock_response(request)):
+            yield event
+        return
+
+    if not sent_message:
+        yield "message", {"agent_message": result.agent_message}
+    for product in result.products[sent_products:]:
+        yield "product", product
+    yield "result", result
+
+
+# =============================================
+# MOCK FALLBACK — keyword tables
+# =============================================
+_JACKET_WORDS = frozenset({"jacket", "coat", "warm", "winter", "cold", "parka"})
+# Checked in order — the first hit wins
+_JACKET_USE_CASES = (
+    ("ski", "skiing"),
+    ("hik", "hiking"),
+    ("rain", "rain protection"),
+    ("business", "business/formal"),
+    ("casual", "casual everyday"),
+    ("puffer", "puffer/insulated"),
+)
+_JACKET_BUDGET_HINTS = frozenset({"budget", "cheap", "premium", "under"})
+_MONITOR_WORDS = frozenset({"monitor", "screen", "display"})
+_HEADPHONE_WORDS = frozenset({"headphone", "earphone", "earbud", "audio", "music"})
+_LAPTOP_WORDS = frozenset({"laptop", "computer", "macbook", "notebook"})
+_SHOE_WORDS = frozenset({"shoe", "sneaker", "running", "trainer", "boots", "footwear"})
+_SHOE_ACTIVITY_WORDS = frozenset({"running", "hiking", "casual", "formal", "gym", "trail"})
+_LUGGAGE_WORDS = frozenset({"suitcase", "luggage", "carry-on", "travel bag"})
+_BUDGET_WORDS = frozenset({"cheap", "budget", "affordable", "inexpensive"})
+_PREMIUM_WORDS = frozenset({"premium", "luxury", "high-end", "best", "top"})
+_FAST_SHIPPING_WORDS = frozenset({"fast", "quick", "urgent", "asap", "rush"})
+_SHOPPING_VERBS = frozenset({"buy", "get", "find", "need", "want", "looking", "recommend"})
+_GENDER_MALE_WORDS = frozenset({"men's", "mens", "for men", "male", "guy", "boyfriend", "husband", "dad"})
+_GENDER_FEMALE_WORDS = frozenset({"women's", "womens", "for women", "female", "girl", "girlfriend", "wife", "mom"})
+# Preference signals — (keyword, value) pairs, checked in order
+_USE_CASE_SIGNALS = (
+    ("hiking", "hiking"), ("ski", "skiing"), ("running", "running"),
+    ("gaming", "gaming"), ("office", "office"), ("travel", "travel"),
+    ("gym", "gym"), ("work", "work"), ("school", "school"),
+    ("camping", "camping"), ("commut", "commuting"),
+)
+_STYLE_SIGNALS = (
+    ("casual", "casual"), ("formal", "formal"), ("sporty", "sporty"),
+    ("minimalist", "minimalist"), ("streetwear", "streetwear"),
+    ("classic", "classic"), ("modern", "modern"),
+)
+_CLIMATE_SIGNALS = (
+    ("cold", "cold"), ("snow", "cold"), ("winter", "cold"),
+    ("rain", "rainy"), ("tropical", "tropical"), ("hot", "hot"),
+    ("warm weather", "warm"),
+)
+_COLORS = ("black", "white", "blue", "red", "green", "gray", "grey",
+           "navy", "olive", "tan", "brown", "pink", "purple", "orange")
+
+# Category detection — (keywords, category, thinking), first hit wins.
+# Jackets and shoes may still stop to ask a clarifying question.
+_CATEGORY_RULES = (
+    (_JACKET_WORDS, "winter_jackets", None),
+    (_MONITOR_WORDS, "monitors",
+     "User is looking for a monitor. Checking profile for use-case (gaming, office, creative)."),
+    (_HEADPHONE_WORDS, "headphones",
+     "User wants audio gear. Considering their style and use-case preferences."),
+    (_LAPTOP_WORDS, "laptops",
+     "User needs a laptop. Will factor in their interests and budget."),
+    (_SHOE_WORDS, "running_shoes",
+     "User wants shoes for a specific activity. Matching to best options."),
+    (_LUGGAGE_WORDS, "luggage",
+     "User needs luggage. Checking if they travel frequently."),
+)
+
+
+# Every keyword above, deduplicated, for the one-pass scan
+_ALL_KEYWORDS = tuple(frozenset().union(
+    _JACKET_WORDS, (kw for kw, _ in _JACKET_USE_CASES), _JACKET_BUDGET_HINTS,
+    _MONITOR_WORDS, _HEADPHONE_WORDS, _LAPTOP_WORDS, _SHOE_WORDS,
+    _SHOE_ACTIVITY_WORDS, _LUGGAGE_WORDS, _BUDGET_WORDS, _PREMIUM_WORDS,
+    _FAST_SHIPPING_WORDS, _SHOPPING_VERBS, _GENDER_MALE_WORDS,
+    _GENDER_FEMALE_WORDS, _COLORS,
+    (kw for kw, _ in _USE_CASE_SIGNALS + _STYLE_SIGNALS + _CLIMATE_SIGNALS),
+))
+
+
+def _scan_keywords(text: str) -> frozenset[str]:
+    """Return every keyword from the tables above that occurs in ``text``.
+
+    One C-level substring pass over the keyword union; the per-branch
+    checks below are then frozenset-vs-frozenset ``isdisjoint`` calls.
+    Matching stays substring-based because several keywords are stems
+    ("hik") or must also match plurals ("jackets").
+    """
+    return frozenset(filter(text.__contains__, _ALL_KEYWORDS))
+
+
+@dataclass(slots=True, frozen=True)
+class _ParsedQuery:
+    """A query lowercased, split and keyword-scanned once for the mock helpers."""
+    raw: str
+    lower: str
+    words: tuple[str, ...]
+    keywords: frozenset[str]
+
+    @classmethod
+    def from_text(cls, text: str) -> "_ParsedQuery":
+        lower = text.lower()
+        return cls(text, lower, tuple(lower.split()), _scan_keywords(lower))
 
 
 def generate_mock_response(request: SearchRequest) -> SearchResponse:
     """Generate a smart mock response when OpenRouter is unavailable."""
-    from mock_data import get_mock_products
-
-    query_lower = request.query.lower()
+    query = _ParsedQuery.from_text(request.query)
+    keywords = query.keywords
 
     # ── Smarter category detection with sub-types ──
-    category = "general"
-    thinking = None
+    category, thinking = next(
+        ((cat, note) for words, cat, note in _CATEGORY_RULES if not keywords.isdisjoint(words)),
+        ("general", None),
+    )
     follow_up = None
 
     # Check if this is a broad/ambiguous query that needs clarification
-    jacket_words = ["jacket", "coat", "warm", "winter", "cold", "parka"]
-    shoe_words = ["shoe", "sneaker", "running", "trainer", "boots", "footwear"]
-    electronics_words = ["monitor", "screen", "display", "headphone", "earphone",
-                         "earbud", "audio", "music", "laptop", "computer", "macbook", "notebook"]
-
-    if any(w in query_lower for w in jacket_words):
+    if category == "winter_jackets":
         # Check if the use-case is specified
-        use_cases = {
-            "ski": "skiing",
-            "hik": "hiking",
-            "rain": "rain protection",
-            "business": "business/formal",
-            "casual": "casual everyday",
-            "puffer": "puffer/insulated",
-        }
-        matched_use = None
-        for kw, uc in use_cases.items():
-            if kw in query_lower:
-                matched_use = uc
-                break
+        matched_use = next((uc for kw, uc in _JACKET_USE_CASES if kw in keywords), None)
 
         # Check if user profile already gives us enough context to skip the question
         has_profile_context = False
@@ -251,7 +613,7 @@ def generate_mock_response(request: SearchRequest) -> SearchResponse:
                 if lp.use_cases:
                     matched_use = lp.use_cases[0]
 
-        if matched_use is None and not has_profile_context and not any(w in query_lower for w in ["budget", "cheap", "premium", "under"]):
+        if matched_use is None and not has_profile_context and keywords.isdisjoint(_JACKET_BUDGET_HINTS):
             # Only ask if truly ambiguous AND no profile context helps
             thinking = "User wants a jacket but didn't specify the type or use-case. Need to narrow it down."
             follow_up = FollowUpQuestion(
@@ -273,25 +635,15 @@ def generate_mock_response(request: SearchRequest) -> SearchResponse:
                 follow_up_question=follow_up,
                 learned_preferences=None,
             )
-        category = "winter_jackets"
         thinking = f"User wants a jacket for {matched_use or 'winter/cold weather'}. Using their profile to personalize."
-    elif any(w in query_lower for w in ["monitor", "screen", "display"]):
-        category = "monitors"
-        thinking = "User is looking for a monitor. Checking profile for use-case (gaming, office, creative)."
-    elif any(w in query_lower for w in ["headphone", "earphone", "earbud", "audio", "music"]):
-        category = "headphones"
-        thinking = "User wants audio gear. Considering their style and use-case preferences."
-    elif any(w in query_lower for w in ["laptop", "computer", "macbook", "notebook"]):
-        category = "laptops"
-        thinking = "User needs a laptop. Will factor in their interests and budget."
-    elif any(w in query_lower for w in shoe_words):
+    elif category == "running_shoes":
         has_shoe_context = False
         if request.user_profile:
             lp = request.user_profile.learned
             if lp.use_cases or lp.style:
                 has_shoe_context = True
 
-        if not has_shoe_context and not any(w in query_lower for w in ["running", "hiking", "casual", "formal", "gym", "trail"]):
+        if not has_shoe_context and keywords.isdisjoint(_SHOE_ACTIVITY_WORDS):
             thinking = "User wants shoes but didn't specify the activity. Need to clarify."
             follow_up = FollowUpQuestion(
                 question="What will you mainly use these shoes for?",
@@ -312,24 +664,19 @@ def generate_mock_response(request: SearchRequest) -> SearchResponse:
                 follow_up_question=follow_up,
                 learned_preferences=None,
             )
-        category = "running_shoes"
-        thinking = "User wants shoes for a specific activity. Matching to best options."
-    elif any(w in query_lower for w in ["suitcase", "luggage", "carry-on", "travel bag"]):
-        category = "luggage"
-        thinking = "User needs luggage. Checking if they travel frequently."
 
     products = get_mock_products(category)
 
     # Determine quality level from query
     quality = "balanced"
-    if any(w in query_lower for w in ["cheap", "budget", "affordable", "inexpensive"]):
+    if not keywords.isdisjoint(_BUDGET_WORDS):
         quality = "budget"
-    elif any(w in query_lower for w in ["premium", "luxury", "high-end", "best", "top"]):
+    elif not keywords.isdisjoint(_PREMIUM_WORDS):
         quality = "premium"
 
     # Determine shipping priority
     shipping = "normal"
-    if any(w in query_lower for w in ["fast", "quick", "urgent", "asap", "rush"]):
+    if not keywords.isdisjoint(_FAST_SHIPPING_WORDS):
         shipping = "fastest"
 
     # Build smart agent message using profile context
@@ -363,14 +710,11 @@ def generate_mock_response(request: SearchRequest) -> SearchResponse:
         thinking = f"Matched query to {category_display}. Quality: {quality}, Shipping: {shipping}."
 
     # Try to learn something from the query
-    learned = _extract_preferences_from_query(query_lower)
+    learned = _extract_preferences_from_query(query)
 
     if category == "general":
         # Only ask for category if the query is truly vague (very short / no product signal)
-        words = query_lower.split()
-        is_very_vague = len(words) <= 2 and not any(
-            w in query_lower for w in ["buy", "get", "find", "need", "want", "looking", "recommend"]
-        )
+        is_very_vague = len(query.words) <= 2 and keywords.isdisjoint(_SHOPPING_VERBS)
         if is_very_vague:
             follow_up = FollowUpQuestion(
                 question="I'd love to help! What kind of product are you looking for?",
@@ -401,58 +745,34 @@ def generate_mock_response(request: SearchRequest) -> SearchResponse:
     )
 
 
-def _extract_preferences_from_query(query: str) -> Optional[LearnedPreferences]:
+def _extract_preferences_from_query(query: _ParsedQuery) -> Optional[LearnedPreferences]:
     """Extract any preference signals from the raw query text."""
+    keywords = query.keywords
     learned = {}
 
     # Gender signals
-    gender_male = ["men's", "mens", "for men", "male", "guy", "boyfriend", "husband", "dad"]
-    gender_female = ["women's", "womens", "for women", "female", "girl", "girlfriend", "wife", "mom"]
-    if any(w in query for w in gender_male):
+    if not keywords.isdisjoint(_GENDER_MALE_WORDS):
         learned["gender"] = "male"
-    elif any(w in query for w in gender_female):
+    elif not keywords.isdisjoint(_GENDER_FEMALE_WORDS):
         learned["gender"] = "female"
 
     # Use-case signals
-    use_cases = []
-    uc_map = {
-        "hiking": "hiking", "ski": "skiing", "running": "running",
-        "gaming": "gaming", "office": "office", "travel": "travel",
-        "gym": "gym", "work": "work", "school": "school",
-        "camping": "camping", "commut": "commuting",
-    }
-    for kw, uc in uc_map.items():
-        if kw in query:
-            use_cases.append(uc)
+    use_cases = [uc for kw, uc in _USE_CASE_SIGNALS if kw in keywords]
     if use_cases:
         learned["use_cases"] = use_cases
 
     # Style signals
-    style_map = {
-        "casual": "casual", "formal": "formal", "sporty": "sporty",
-        "minimalist": "minimalist", "streetwear": "streetwear",
-        "classic": "classic", "modern": "modern",
-    }
-    for kw, st in style_map.items():
-        if kw in query:
-            learned["style"] = st
-            break
+    style = next((st for kw, st in _STYLE_SIGNALS if kw in keywords), None)
+    if style:
+        learned["style"] = style
 
     # Climate signals
-    climate_map = {
-        "cold": "cold", "snow": "cold", "winter": "cold",
-        "rain": "rainy", "tropical": "tropical", "hot": "hot",
-        "warm weather": "warm",
-    }
-    for kw, cl in climate_map.items():
-        if kw in query:
-            learned["climate"] = cl
-            break
+    climate = next((cl for kw, cl in _CLIMATE_SIGNALS if kw in keywords), None)
+    if climate:
+        learned["climate"] = climate
 
     # Color signals
-    colors = ["black", "white", "blue", "red", "green", "gray", "grey",
-              "navy", "olive", "tan", "brown", "pink", "purple", "orange"]
-    found_colors = [c for c in colors if c in query]
+    found_colors = [c for c in _COLORS if c in keywords]
     if found_colors:
         learned["favorite_colors"] = found_colors
 
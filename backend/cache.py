@@ -0,0 +1,81 @@
+"""
+In-process caching helpers shared by the AI and scraper services.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+
+class LRUCache(Generic[K, V]):
+    """Dict-backed cache holding at most ``max_entries`` items.
+
+    Dicts keep insertion order, so re-inserting on each hit keeps the least
+    recently used entry first, and that is the one evicted when full.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: dict[K, V] = {}
+
+    def get(self, key: K, default=None):
+        """Cached value for key, or default. A hit becomes the most recently used."""
+        value = self._data.pop(key, default)
+        if value is not default:
+            self._data[key] = value
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._data.pop(key, None)
+        if len(self._data) >= self.max_entries:
+            del self._data[next(iter(self._data))]
+        self._data[key] = value
+
+    def pop(self, key: K, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight(Generic[K, T]):
+    """Runs at most one call per key at a time; concurrent callers share it.
+
+    The call runs as its own task and callers await it through a shield, so
+    one caller being cancelled doesn't cancel it for the others. Once every
+    caller has left, nobody can use the result, so the call is cancelled.
+    """
+
+    def __init__(self):
+        # key -> [task, number of callers awaiting it]
+        self._calls: dict[K, list] = {}
+
+    async def run(self, key: K, call: Callable[[], Awaitable[T]]) -> T:
+        entry = self._calls.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(call())
+            entry = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda _: self._forget(key, entry))
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                self._forget(key, entry)
+                task.cancel()
+
+    def _forget(self, key: K, entry: list) -> None:
+        # A cancelled call may finish after a new one started for the same key
+        if self._calls.get(key) is entry:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
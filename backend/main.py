@@ -5,16 +5,23 @@ Slim entry point: creates the FastAPI app, adds middleware, and includes
 all feature routers. Each feature lives in its own module under routers/.
 """
 
+import atexit
+import logging
 import os
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import asyncio
 
-from tracking_service import update_activity, watchlist_tracking_loop, purchase_tracking_loop
+from tracking_service import stamp_activity, watchlist_tracking_loop, purchase_tracking_loop
 from scraper import close_client as close_scraper_client
-from storage import watchlist, purchase_history, update_watchlist_price
+from ai_service import close_client as close_ai_client
+from storage import purchases_snapshot, watchlist_snapshot, update_watchlist_price
+from responses import JSONResponse
 from routers import (
     search_router,
     purchases_router,
@@ -26,79 +33,102 @@ from routers import (
 )
 
 
+# ── Logging ──────────────────────────────────────────────
+# Records are queued and written from a listener thread, so a burst of
+# errors never blocks the event loop on a synchronous stdout pipe.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+
+_logger = logging.getLogger("cliq")
+_logger.setLevel(logging.INFO)
+_logger.addHandler(QueueHandler(_log_queue))
+_logger.propagate = False
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+
 # ── Background task management ───────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     wl_task = asyncio.create_task(
         watchlist_tracking_loop(
-            get_watchlist=lambda: list(watchlist),
+            get_watchlist=watchlist_snapshot,
             update_watchlist_price=update_watchlist_price,
         )
     )
     pl_task = asyncio.create_task(
         purchase_tracking_loop(
-            get_purchases=lambda: list(purchase_history),
+            get_purchases=purchases_snapshot,
         )
     )
     yield
-    wl_task.cancel()
-    pl_task.cancel()
-    await close_scraper_client()
-
+    tasks = (wl_task, pl_task)
+    for task in tasks:
+        task.cancel()
+    # Shielded so a second shutdown signal can't abandon the loops or pools mid-teardown
+    await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
+    await asyncio.shield(close_scraper_client())
+    await asyncio.shield(close_ai_client())
+
+
+app = FastAPI(
+    title="Cliq — AI Shopping Agent",
+    version="2.0.0",
+    lifespan=lifespan,
+)
 
-app = FastAPI(title="Cliq — AI Shopping Agent", version="2.0.0", lifespan=lifespan)
 
 # CORS — allow frontend dev servers and Vercel production/preview deployments
-ALLOWED_ORIGINS = [
+# This deployment's own Vercel URLs (preview and production)
+_vercel_origins = (
+    f"https://{url}"
+    for url in (os.environ.get("VERCEL_URL"), os.environ.get("VERCEL_PROJECT_PRODUCTION_URL"))
+    if url
+)
+
+# Checked on every request: a frozenset for O(1) lookups, the regex compiled once
+ALLOWED_ORIGINS = frozenset({
     "http://localhost:5173",
     "http://localhost:3000",
     "http://127.0.0.1:5173",
-]
-
-# Allow all Vercel preview/production URLs for this project
-VERCEL_URL = os.environ.get("VERCEL_URL")
-if VERCEL_URL:
-    ALLOWED_ORIGINS.append(f"https://{VERCEL_URL}")
-
-VERCEL_PROJECT_PRODUCTION_URL = os.environ.get("VERCEL_PROJECT_PRODUCTION_URL")
-if VERCEL_PROJECT_PRODUCTION_URL:
-    ALLOWED_ORIGINS.append(f"https://{VERCEL_PROJECT_PRODUCTION_URL}")
+    *_vercel_origins,
+})
+VERCEL_ORIGIN_REGEX = re.compile(r"https://.*\.vercel\.app")
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
-    allow_origin_regex=r"https://.*\.vercel\.app",
+    allow_origin_regex=VERCEL_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
-# ── Activity tracking middleware ─────────────────────────
-@app.middleware("http")
-async def track_activity(request: Request, call_next):
-    update_activity()
-    response = await call_next(request)
-    return response
-
-
 # ── Register feature routers ────────────────────────────
-app.include_router(search_router)
-app.include_router(purchases_router)
-app.include_router(profile_router)
-app.include_router(watchlist_router)
-app.include_router(coupons_router)
-app.include_router(spending_router)
+# User-facing routers mark the user active on each request. Tracking status
+# polls, the root endpoint and CORS preflights don't count as activity.
+_user_activity = [Depends(stamp_activity)]
+
+app.include_router(search_router, dependencies=_user_activity)
+app.include_router(purchases_router, dependencies=_user_activity)
+app.include_router(profile_router, dependencies=_user_activity)
+app.include_router(watchlist_router, dependencies=_user_activity)
+app.include_router(coupons_router, dependencies=_user_activity)
+app.include_router(spending_router, dependencies=_user_activity)
 app.include_router(tracking_router)
 
 
 @app.get("/")
 async def root():
-    return {
+    return JSONResponse({
         "message": "Cliq AI Shopping Agent API",
         "version": "2.0.0",
         "endpoints": {
             "search": "POST /api/search",
+            "search_stream": "POST /api/search/stream",
             "purchase": "POST /api/purchase",
             "purchases": "GET /api/purchases",
             "profile": "GET|POST /api/profile",
@@ -106,7 +136,8 @@ async def root():
             "coupons": "GET /api/coupons/{product_id}",
             "spending": "GET /api/spending",
             "tracking_status": "GET /api/tracking/status",
+            "tracking_summary": "GET /api/tracking/summary",
             "tracking_heartbeat": "POST /api/tracking/heartbeat",
             "purchase_alerts": "GET /api/tracking/purchase-alerts",
         },
-    }
+    })
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from models import Product
 
 MOCK_PRODUCTS: dict[str, list[Product]] = {
@@ -422,11 +423,21 @@ MOCK_PRODUCTS: dict[str, list[Product]] = {
 
 
 def get_mock_products(category: str) -> list[Product]:
-    """Get mock products for a given category."""
+    """Get mock products for a given category.
+
+    Returns fresh copies, so callers (image enrichment) can set fields on
+    them without leaking into later requests.
+    """
+    return [product.model_copy() for product in _mock_products(category)]
+
+
+@lru_cache(maxsize=32)
+def _mock_products(category: str) -> tuple[Product, ...]:
+    """The shared product objects for a category; cached, never mutated."""
     if category in MOCK_PRODUCTS:
-        return MOCK_PRODUCTS[category]
+        return tuple(MOCK_PRODUCTS[category])
     # Return a mix if category not found
     all_products = []
     for cat_products in MOCK_PRODUCTS.values():
         all_products.extend(cat_products[:2])
-    return all_products[:5]
+    return tuple(all_products[:5])
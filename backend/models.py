@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from collections import deque
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+from typing import Deque, Optional, List
 from enum import Enum
 
 
@@ -16,6 +18,9 @@ class ShippingPreference(str, Enum):
 
 
 class LearnedPreferences(BaseModel):
+    # Unknown keys (e.g. stray fields in an LLM reply) are dropped, not stored
+    model_config = ConfigDict(extra="ignore")
+
     gender: Optional[str] = None
     age_range: Optional[str] = None
     style: Optional[str] = None
@@ -26,9 +31,6 @@ class LearnedPreferences(BaseModel):
     favorite_colors: List[str] = []
     climate: Optional[str] = None  # e.g. "cold", "tropical", "temperate"
 
-    class Config:
-        extra = "allow"
-
 
 class UserProfile(BaseModel):
     price_sensitivity: QualityLevel = QualityLevel.balanced
@@ -53,6 +55,11 @@ class PurchaseRequest(BaseModel):
     card_nickname: str
 
 
+# Price points kept per watched item; older points fall off the front. The
+# original price is held separately, so it survives the cap.
+MAX_PRICE_HISTORY = 256
+
+
 class WatchlistItem(BaseModel):
     product_id: str
     product_name: str
@@ -61,7 +68,44 @@ class WatchlistItem(BaseModel):
     brand: str
     source_url: str
     category: str = ""
-    price_history: List[dict] = []
+    price_history: Deque[dict] = deque()
+
+    # Ends of price_history, kept in step by record_price() so readers
+    # don't have to index into the history
+    _original_price: Optional[float] = PrivateAttr(default=None)
+    _previous_price: Optional[float] = PrivateAttr(default=None)
+    _current_price: Optional[float] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context) -> None:
+        # Client-supplied points may lack a price; read those as the item's price
+        history = self.price_history
+        if history:
+            self._original_price = history[0].get("price", self.price)
+            self._current_price = history[-1].get("price", self.price)
+        if len(history) > 1:
+            self._previous_price = history[-2].get("price", self.price)
+        self.price_history = deque(history, maxlen=MAX_PRICE_HISTORY)
+
+    def record_price(self, price: float, date: str) -> None:
+        """Append a price point and make it the item's current price."""
+        self.price_history.append({"price": price, "date": date})
+        if self._original_price is None:
+            self._original_price = price
+        self._previous_price = self._current_price
+        self._current_price = price
+        self.price = price
+
+    @property
+    def original_price(self) -> Optional[float]:
+        return self._original_price
+
+    @property
+    def previous_price(self) -> Optional[float]:
+        return self._previous_price
+
+    @property
+    def current_price(self) -> Optional[float]:
+        return self._current_price
 
 
 class Product(BaseModel):
@@ -126,3 +170,13 @@ class PurchaseRecord(BaseModel):
     card_nickname: str
     timestamp: str
     shipping_status: ShippingStatus = ShippingStatus.processing
+
+    # timestamp as a POSIX time, parsed once for the shipping simulation
+    _purchased_at: float = PrivateAttr(default=0.0)
+
+    def model_post_init(self, __context) -> None:
+        self._purchased_at = datetime.fromisoformat(self.timestamp).timestamp()
+
+    @property
+    def purchased_at(self) -> float:
+        return self._purchased_at
@@ -0,0 +1,55 @@
+"""
+Response classes shared by the app and routers.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse as _StarletteJSONResponse, Response
+from pydantic_core import to_json
+
+
+def cache_headers(max_age: int, *, private: bool = False, stale_while_revalidate: int = 0) -> dict[str, str]:
+    """Cache-Control header for a GET response that browsers (and, unless
+    ``private``, shared caches) may reuse for ``max_age`` seconds."""
+    value = f"{'private' if private else 'public'}, max-age={max_age}"
+    if stale_while_revalidate:
+        value += f", stale-while-revalidate={stale_while_revalidate}"
+    return {"Cache-Control": value}
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode like JSONResponse does, for bodies that are cached as bytes."""
+    return to_json(content, inf_nan_mode="null")
+
+
+class JSONResponse(_StarletteJSONResponse):
+    """JSON response rendered by pydantic-core's Rust encoder instead of json.dumps.
+
+    Output matches the stock response: compact, UTF-8, and non-finite floats
+    are written as null rather than producing invalid JSON.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+class EncodedJSONResponse(Response):
+    """Response for a body that is already JSON-encoded bytes (sent as-is)."""
+
+    media_type = "application/json"
+
+
+def revalidated_json(request: Request, body: bytes) -> Response:
+    """Encoded JSON body for mutable per-user state.
+
+    Sent ``no-cache`` with an ETag of the body: browsers revalidate on every
+    read, so a change shows up at once, and an unchanged body costs a 304.
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"Cache-Control": "private, no-cache", "ETag": etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return EncodedJSONResponse(body, headers=headers)
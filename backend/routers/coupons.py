@@ -1,17 +1,30 @@
+from types import MappingProxyType
+
 from fastapi import APIRouter
 
+from responses import JSONResponse, cache_headers
+
 router = APIRouter(prefix="/api", tags=["coupons"])
 
+# Built once at import; read-only so a handler can't mutate the shared data
+_MOCK_COUPONS = MappingProxyType({
+    "wj-001": ({"code": "WINTER20", "discount": "20% off", "source": "RetailMeNot"},),
+    "wj-002": (
+        {"code": "SAVE15", "discount": "15% off", "source": "Honey"},
+        {"code": "FREESHIP", "discount": "Free shipping", "source": "Deal Finder"},
+    ),
+    "mon-001": ({"code": "TECH10", "discount": "$10 off", "source": "Honey"},),
+    "hp-003": ({"code": "AUDIO20", "discount": "20% off", "source": "RetailMeNot"},),
+})
+
+
+# The coupon table never changes while the app runs
+_CACHE_HEADERS = cache_headers(60, stale_while_revalidate=300)
+
 
 @router.get("/coupons/{product_id}")
 async def get_coupons(product_id: str):
-    mock_coupons = {
-        "wj-001": [{"code": "WINTER20", "discount": "20% off", "source": "RetailMeNot"}],
-        "wj-002": [
-            {"code": "SAVE15", "discount": "15% off", "source": "Honey"},
-            {"code": "FREESHIP", "discount": "Free shipping", "source": "Deal Finder"},
-        ],
-        "mon-001": [{"code": "TECH10", "discount": "$10 off", "source": "Honey"}],
-        "hp-003": [{"code": "AUDIO20", "discount": "20% off", "source": "RetailMeNot"}],
-    }
-    return {"product_id": product_id, "coupons": mock_coupons.get(product_id, [])}
+    return JSONResponse(
+        {"product_id": product_id, "coupons": _MOCK_COUPONS.get(product_id, ())},
+        headers=_CACHE_HEADERS,
+    )
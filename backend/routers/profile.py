@@ -1,17 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 from models import UserProfile
+from responses import EncodedJSONResponse, revalidated_json
 import storage
 
 router = APIRouter(prefix="/api", tags=["profile"])
 
 
 @router.get("/profile")
-async def get_profile():
-    return storage.user_profile.model_dump()
+async def get_profile(request: Request):
+    return revalidated_json(request, storage.user_profile_json())
 
 
 @router.post("/profile")
 async def update_profile(profile: UserProfile):
-    storage.user_profile = profile
-    return {"status": "success", "profile": storage.user_profile.model_dump()}
+    storage.set_user_profile(profile)
+    return EncodedJSONResponse(b'{"status":"success","profile":%b}' % storage.user_profile_json())
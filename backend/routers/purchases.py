@@ -1,31 +1,32 @@
+import time
 import uuid
+from bisect import bisect_right
 from datetime import datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 from models import PurchaseRequest, PurchaseRecord, ShippingStatus
-from storage import purchase_history
+from responses import JSONResponse, revalidated_json
+from storage import purchase_history, add_purchase, purchases_json, invalidate_purchases
 
 router = APIRouter(prefix="/api", tags=["purchases"])
 
-# Shipping status progression thresholds (seconds since purchase)
-_STATUS_THRESHOLDS = [
-    (300, ShippingStatus.delivered),         # 5 min+
-    (210, ShippingStatus.out_for_delivery),  # 3.5 min+
-    (150, ShippingStatus.in_transit),        # 2.5 min+
-    (90,  ShippingStatus.shipped),           # 1.5 min+
-    (40,  ShippingStatus.confirmed),         # 40s+
+# Shipping status progression: (seconds since purchase, status reached), ascending
+_STATUS_THRESHOLDS = (
     (0,   ShippingStatus.processing),        # 0s+
-]
+    (40,  ShippingStatus.confirmed),         # 40s+
+    (90,  ShippingStatus.shipped),           # 1.5 min+
+    (150, ShippingStatus.in_transit),        # 2.5 min+
+    (210, ShippingStatus.out_for_delivery),  # 3.5 min+
+    (300, ShippingStatus.delivered),         # 5 min+
+)
+_THRESHOLD_SECONDS = tuple(seconds for seconds, _ in _STATUS_THRESHOLDS)
 
 
-def _compute_status(purchase_time: str) -> ShippingStatus:
-    """Compute simulated shipping status based on elapsed time."""
-    elapsed = (datetime.now() - datetime.fromisoformat(purchase_time)).total_seconds()
-    for threshold, status in _STATUS_THRESHOLDS:
-        if elapsed >= threshold:
-            return status
-    return ShippingStatus.processing
+def _compute_status(elapsed: float) -> ShippingStatus:
+    """Compute simulated shipping status from seconds elapsed since purchase."""
+    index = bisect_right(_THRESHOLD_SECONDS, elapsed) - 1
+    return _STATUS_THRESHOLDS[max(index, 0)][1]
 
 
 @router.post("/purchase")
@@ -41,28 +42,31 @@ async def purchase(request: PurchaseRequest):
         card_nickname=request.card_nickname,
         timestamp=datetime.now().isoformat(),
     )
-    purchase_history.append(record)
-    return {
+    add_purchase(record)
+    return JSONResponse({
         "status": "success",
         "message": f"Purchase of {request.product_name} confirmed!",
         "record": record.model_dump(),
-    }
+    })
 
 
 @router.get("/purchases")
-async def get_purchases():
+async def get_purchases(request: Request):
     """Get purchase history."""
-    return {"purchases": [p.model_dump() for p in purchase_history]}
+    return revalidated_json(request, b'{"purchases":%b}' % purchases_json())
 
 
 @router.get("/purchases/shipping")
 async def get_shipping_statuses():
     """Get live shipping status for all purchases (simulated progression)."""
     results = []
+    now = time.time()
     for p in purchase_history:
-        current_status = _compute_status(p.timestamp)
+        current_status = _compute_status(now - p.purchased_at)
         # Update the stored status
-        p.shipping_status = current_status
+        if p.shipping_status != current_status:
+            p.shipping_status = current_status
+            invalidate_purchases()
         results.append({
             "order_id": p.order_id,
             "product_id": p.product_id,
@@ -70,4 +74,4 @@ async def get_shipping_statuses():
             "shipping_status": current_status.value,
             "timestamp": p.timestamp,
         })
-    return {"shipments": results}
+    return JSONResponse({"shipments": results})
@@ -1,24 +1,24 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 
 from models import SearchRequest, SearchResponse
-from ai_service import interpret_query_with_gemini
+from ai_service import interpret_query_with_gemini, stream_query_with_gemini
 from scraper import enrich_products_with_images
-from storage import user_profile
+import storage
 
 router = APIRouter(prefix="/api", tags=["search"])
 
 
-@router.post("/search", response_model=SearchResponse)
-async def search(request: SearchRequest):
-    """Main search endpoint — interprets natural language queries via AI."""
+def _prepare(request: SearchRequest) -> None:
     if not request.query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
 
     if request.user_profile is None:
-        request.user_profile = user_profile
+        request.user_profile = storage.user_profile
 
-    response = await interpret_query_with_gemini(request)
 
+async def _enrich(response: SearchResponse) -> None:
     # Try to scrape real product images from source URLs
     if response.products:
         try:
@@ -26,4 +26,33 @@ async def search(request: SearchRequest):
         except Exception:
             pass  # Keep existing image_url values on failure
 
+
+@router.post("/search", response_model=SearchResponse)
+async def search(request: SearchRequest):
+    """Main search endpoint — interprets natural language queries via AI."""
+    _prepare(request)
+    response = await interpret_query_with_gemini(request)
+    await _enrich(response)
     return response
+
+
+@router.post("/search/stream")
+async def search_stream(request: SearchRequest):
+    """Streaming search — Server-Sent Events as the AI response is generated.
+
+    Emits a `message` event with the agent message, a `product` event per
+    product as it completes, then a `result` event with the full response
+    (images enriched) in the same shape as POST /api/search. A `reset` event
+    means the AI response failed mid-stream: discard the events so far, the
+    fallback response follows in full.
+    """
+    _prepare(request)
+
+    async def event_stream():
+        async for event, data in stream_query_with_gemini(request):
+            if event == "result":
+                await _enrich(data)
+            # Encoded straight to bytes; StreamingResponse sends them as-is
+            yield b"event: %b\ndata: %b\n\n" % (event.encode(), to_json(data))
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -1,50 +1,74 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from tracking_service import (
     update_activity,
+    stamp_activity,
     get_tracking_status,
     get_purchase_alerts,
+    purchase_alert_savings,
     clear_purchase_alert,
 )
-from storage import watchlist, purchase_history
+from responses import EncodedJSONResponse, JSONResponse, encode_json
+from storage import watchlist, purchase_history, price_drops_json
 
 router = APIRouter(prefix="/api", tags=["tracking"])
 
 
-@router.get("/tracking/status")
-async def tracking_status():
-    """Get live tracking status — is it running? when was user last active?"""
+def _status() -> dict:
     status = get_tracking_status()
     status["watchlist_count"] = len(watchlist)
     status["purchase_count"] = len(purchase_history)
     return status
 
 
+def _alerts() -> dict:
+    alerts = get_purchase_alerts()
+    return {
+        "alerts": alerts,
+        "count": len(alerts),
+        "total_potential_savings": round(purchase_alert_savings(), 2),
+    }
+
+
+@router.get("/tracking/status")
+async def tracking_status():
+    """Get live tracking status — is it running? when was user last active?"""
+    return JSONResponse(_status())
+
+
+@router.get("/tracking/summary")
+async def tracking_summary():
+    """Tracking status, watchlist price drops and purchase alerts in one poll.
+
+    Each part has the same shape as its own endpoint (/tracking/status,
+    /price-drops, /tracking/purchase-alerts).
+    """
+    return EncodedJSONResponse(
+        b'{"tracking":%b,"drops":%b,"alerts":%b}'
+        % (encode_json(_status()), price_drops_json(), encode_json(_alerts()))
+    )
+
+
 @router.post("/tracking/heartbeat")
 async def tracking_heartbeat():
     """Frontend heartbeat to keep tracking alive."""
     update_activity()
     status = get_tracking_status()
-    return {
+    return JSONResponse({
         "status": "alive",
         "tracking": status["tracking_running"],
         "last_active": status["last_active"],
-    }
+    })
 
 
 @router.get("/tracking/purchase-alerts")
 async def purchase_alerts():
     """Get price drop alerts for past purchases."""
-    alerts = get_purchase_alerts()
-    return {
-        "alerts": alerts,
-        "count": len(alerts),
-        "total_potential_savings": round(sum(a["savings"] for a in alerts), 2),
-    }
+    return JSONResponse(_alerts())
 
 
-@router.delete("/tracking/purchase-alerts/{product_id}")
+@router.delete("/tracking/purchase-alerts/{product_id}", dependencies=[Depends(stamp_activity)])
 async def dismiss_purchase_alert(product_id: str):
     """Dismiss a purchase price alert."""
     clear_purchase_alert(product_id)
-    return {"status": "dismissed", "product_id": product_id}
+    return JSONResponse({"status": "dismissed", "product_id": product_id})
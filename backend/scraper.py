@@ -11,16 +11,53 @@ Falls back to the existing image_url if all strategies fail.
 
 import asyncio
 import re
-from typing import Optional
-from urllib.parse import urljoin, quote_plus
+import time
+import zlib
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AsyncIterator, Awaitable, Callable, Mapping, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit, quote_plus
 
 import httpx
+from pydantic_core import from_json
+
+from cache import LRUCache, SingleFlight
 
 # Shared async client – reused across scrape calls
 _client: Optional[httpx.AsyncClient] = None
 
-# In-memory cache: cache_key -> scraped image URL (or None on failure)
-_cache: dict[str, Optional[str]] = {}
+# Outbound fetch limits: overall, and per host so a single retailer (or Bing)
+# never sees a whole result page of requests at once
+MAX_CONCURRENT_FETCHES = 16
+MAX_FETCHES_PER_HOST = 4
+_fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+# host -> [semaphore, fetches holding or waiting on it]; a host is dropped
+# once its last fetch finishes, so only hosts in use are kept
+_host_slots: dict[str, list] = {}
+
+# Overall time budget for enriching one result set, in seconds
+ENRICH_TIMEOUT = 3.0
+
+# Hosts whose pages keep yielding no image (bot walls, script-only shells)
+# are skipped for HOST_SKIP_SECONDS after this many misses in a row. Only a
+# page that answered counts as a miss, never a timeout or dropped connection.
+HOST_MISS_LIMIT = 3
+HOST_SKIP_SECONDS = 10 * 60
+# Per-host state is kept for this many recently seen hosts
+HOST_STATE_MAX_ENTRIES = 1024
+_host_misses: LRUCache[str, int] = LRUCache(HOST_STATE_MAX_ENTRIES)
+# host -> time.monotonic() until which it isn't fetched
+_host_skip_until: LRUCache[str, float] = LRUCache(HOST_STATE_MAX_ENTRIES)
+# Statuses that mean the host is turning scrapers away, not just missing a page
+_BOT_WALL_STATUSES = frozenset({403, 429})
+
+# In-memory LRU cache: cache_key -> scraped image URL (or None on failure)
+SCRAPE_CACHE_MAX_ENTRIES = 4096
+_cache: LRUCache[str, Optional[str]] = LRUCache(SCRAPE_CACHE_MAX_ENTRIES)
+_MISS = object()
+# cache_key -> lookup in progress, shared by concurrent callers for that key
+_inflight: SingleFlight[str, Optional[str]] = SingleFlight()
 
 # Common browser-like headers to reduce bot-blocking
 _HEADERS = {
@@ -35,49 +72,50 @@ _HEADERS = {
 
 # Category-based fallback images — real, working Unsplash photo URLs.
 # Multiple aliases per category so AI-generated category strings get matched.
-_JACKET_IMAGES = [
+# Built once at import and read-only, so lookups can hand out shared references.
+_JACKET_IMAGES = (
     "https://images.unsplash.com/photo-1544923246-77307dd270b1?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1551488831-00ddcb6c6bd3?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1591047139829-d91aecb6caea?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1483664852023-7f44e5484aee?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1495105787522-5334e3ffa0ef?w=400&h=300&fit=crop",
-]
-_MONITOR_IMAGES = [
+)
+_MONITOR_IMAGES = (
     "https://images.unsplash.com/photo-1527443224154-c4a3942d3acf?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1548611716-ad11f5a04b69?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1585792180666-f7347c490ee2?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1616763355548-1b606f439f86?w=400&h=300&fit=crop",
-]
-_HEADPHONE_IMAGES = [
+)
+_HEADPHONE_IMAGES = (
     "https://images.unsplash.com/photo-1505740420928-5e560c06d30e?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1524678606370-a47ad25cb82a?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1583394838336-acd977736f90?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1484704849700-f032a568e944?w=400&h=300&fit=crop",
-]
-_LAPTOP_IMAGES = [
+)
+_LAPTOP_IMAGES = (
     "https://images.unsplash.com/photo-1517336714731-489689fd1ca8?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1588872657578-7efd1f1555ed?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1496181133206-80ce9b88a853?w=400&h=300&fit=crop",
-]
-_SHOE_IMAGES = [
+)
+_SHOE_IMAGES = (
     "https://images.unsplash.com/photo-1542291026-7eec264c27ff?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1606107557195-0e29a4b5b4aa?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1595950653106-6c9ebd614d3a?w=400&h=300&fit=crop",
-]
-_LUGGAGE_IMAGES = [
+)
+_LUGGAGE_IMAGES = (
     "https://images.unsplash.com/photo-1565026057447-bc90a3dceb87?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1581553680321-4fffae59fccd?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1553531384-411a247ccd73?w=400&h=300&fit=crop",
-]
-_GENERIC_IMAGES = [
+)
+_GENERIC_IMAGES = (
     "https://images.unsplash.com/photo-1523275335684-37898b6baf30?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1526170375885-4d8ecf77b99f?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1560343090-f0409e92791a?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1491553895911-0055eca6402d?w=400&h=300&fit=crop",
     "https://images.unsplash.com/photo-1572635196237-14b3f281503f?w=400&h=300&fit=crop",
-]
+)
 
-_CATEGORY_FALLBACKS: dict[str, list[str]] = {
+_CATEGORY_FALLBACKS: Mapping[str, tuple[str, ...]] = MappingProxyType({
     # Jackets / outerwear
     "winter_jackets": _JACKET_IMAGES,
     "jackets": _JACKET_IMAGES,
@@ -120,7 +158,34 @@ _CATEGORY_FALLBACKS: dict[str, list[str]] = {
     "bags": _LUGGAGE_IMAGES,
     # Generic fallback
     "general": _GENERIC_IMAGES,
-}
+})
+
+
+# Only this much of a page is downloaded (bytes) and scanned (characters)
+MAX_HTML_SIZE = 512 * 1024
+
+# Extraction patterns, compiled once at import
+_BING_MURL_RE = re.compile(r'"murl"\s*:\s*"(https?://[^"]+)"')
+# Whole <meta>/<img> tags, and the quoted attributes inside one (any order)
+_META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_IMG_TAG_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_TAG_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_PRODUCT_IMG_HINT_RE = re.compile(r"product|hero|main|primary|featured", re.IGNORECASE)
+_HEAD_END_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+_HEAD_END_TEXT_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+_JSONLD_SCRIPT_RE = re.compile(
+    r'<script[^>]+application/ld\+json[^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+_JSONLD_IMAGE_RE = re.compile(r'"image"\s*:\s*"(https?://[^"]+)"')
+# Substrings marking tiny icons, tracking pixels, SVGs and data URIs, matched
+# in one pass against the lowercased URL
+_IMAGE_SKIP_PATTERNS = (
+    "1x1", "pixel", "spacer", "blank", "tracking",
+    ".svg", ".gif", "data:image", "base64",
+    "logo", "icon", "favicon", "badge", "sprite",
+)
+_IMAGE_SKIP_RE = re.compile("|".join(map(re.escape, _IMAGE_SKIP_PATTERNS)))
 
 
 def _get_client() -> httpx.AsyncClient:
@@ -130,10 +195,77 @@ def _get_client() -> httpx.AsyncClient:
             headers=_HEADERS,
             follow_redirects=True,
             timeout=httpx.Timeout(8.0, connect=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                # Multiplexes the concurrent Bing searches over one connection
+                http2=True,
+                # Sized to the fetch limits above, so a slot never waits on the pool
+                limits=httpx.Limits(
+                    max_connections=MAX_CONCURRENT_FETCHES,
+                    max_keepalive_connections=MAX_CONCURRENT_FETCHES,
+                    keepalive_expiry=30.0,
+                ),
+                # Retries failed connection attempts only; a sent request is never replayed
+                retries=2,
+            ),
         )
     return _client
 
 
+@asynccontextmanager
+async def _open(url: str) -> AsyncIterator[httpx.Response]:
+    """Streamed GET through the shared client, within the global and per-host limits.
+
+    Headers are available on entry; the body is only read if the caller asks.
+    """
+    host = urlsplit(url).hostname or ""
+    entry = _host_slots.get(host)
+    if entry is None:
+        entry = _host_slots[host] = [asyncio.Semaphore(MAX_FETCHES_PER_HOST), 0]
+    entry[1] += 1
+    try:
+        # Host slot first, so requests queued on one busy host don't sit on global slots
+        async with entry[0], _fetch_slots:
+            async with _get_client().stream("GET", url) as resp:
+                yield resp
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _host_slots[host]
+
+
+async def _fetch(url: str) -> httpx.Response:
+    """GET with the body read in full, within the fetch limits."""
+    async with _open(url) as resp:
+        await resp.aread()
+        return resp
+
+
+async def _lookup_once(cache_key: str, find: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+    """Return the cached result for cache_key, running find() for it at most once at a time.
+
+    Callers that arrive while find() runs share its result. One caller giving
+    up doesn't cancel it for the others, but once all of them have (a Bing
+    hit, the enrichment timeout) it is cancelled and no longer fetches.
+    """
+    cached = _cache.get(cache_key, _MISS)
+    if cached is not _MISS:
+        return cached
+    return await _inflight.run(cache_key, lambda: _find_and_cache(cache_key, find))
+
+
+async def _find_and_cache(cache_key: str, find: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+    try:
+        value = await find()
+    except httpx.TransportError:
+        # Timeouts and dropped connections are transient — leave them uncached
+        # so the next search tries this source again
+        return None
+    except Exception:
+        value = None
+    _cache.put(cache_key, value)
+    return value
+
+
 async def close_client() -> None:
     """Close the shared HTTP client. Call on app shutdown."""
     global _client
@@ -146,35 +278,40 @@ async def close_client() -> None:
 # Strategy 1: Bing Image Search
 # ---------------------------------------------------------------------------
 
+def _norm_query(q: str) -> str:
+    """Cache form of a search query: casing and runs of whitespace don't matter."""
+    return " ".join(q.lower().split())
+
+
+def _norm_url(url: str) -> str:
+    """Cache form of a page URL: scheme and host lowercased, fragment dropped.
+
+    The path and query are kept as-is since servers may treat them case-sensitively.
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+
 async def _search_image_bing(query: str) -> Optional[str]:
     """Search Bing Images for a product image and return the first good result."""
-    cache_key = f"bing:{query}"
-    if cache_key in _cache:
-        return _cache[cache_key]
+    cache_key = f"bing:{_norm_query(query)}"
+    return await _lookup_once(cache_key, lambda: _bing_lookup(query))
 
-    search_url = f"https://www.bing.com/images/search?q={quote_plus(query)}&first=1&count=10&qft=+filterui:imagesize-medium"
-    try:
-        client = _get_client()
-        resp = await client.get(search_url)
-        if resp.status_code != 200:
-            _cache[cache_key] = None
-            return None
-
-        # Bing embeds image metadata with "murl" (media URL) in the HTML
-        urls = re.findall(r'"murl"\s*:\s*"(https?://[^"]+)"', resp.text)
-        for url in urls:
-            # Unescape any JSON-escaped characters
-            url = url.replace("\\u0026", "&").replace("\\/", "/")
-            if _is_valid_image_url(url):
-                _cache[cache_key] = url
-                return url
 
-        _cache[cache_key] = None
+async def _bing_lookup(query: str) -> Optional[str]:
+    search_url = f"https://www.bing.com/images/search?q={quote_plus(query)}&first=1&count=10&qft=+filterui:imagesize-medium"
+    resp = await _fetch(search_url)
+    if resp.status_code != 200:
         return None
 
-    except Exception:
-        _cache[cache_key] = None
-        return None
+    # Bing embeds image metadata with "murl" (media URL) in the HTML
+    urls = _BING_MURL_RE.findall(resp.text)
+    for url in urls:
+        # Unescape any JSON-escaped characters
+        url = url.replace("\\u0026", "&").replace("\\/", "/")
+        if _is_valid_image_url(url):
+            return url
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -183,68 +320,120 @@ async def _search_image_bing(query: str) -> Optional[str]:
 
 def _extract_image_from_html(html: str, base_url: str) -> Optional[str]:
     """Extract the best product image URL from raw HTML using regex."""
-
-    # 1. Open Graph image (most reliable for product pages)
-    og_match = re.search(
-        r'<meta[^>]+property\s*=\s*["\']og:image["\'][^>]+content\s*=\s*["\']([^"\']+)["\']',
-        html,
-        re.IGNORECASE,
-    )
-    if not og_match:
-        og_match = re.search(
-            r'<meta[^>]+content\s*=\s*["\']([^"\']+)["\'][^>]+property\s*=\s*["\']og:image["\']',
-            html,
-            re.IGNORECASE,
-        )
-    if og_match:
-        url = og_match.group(1).strip()
-        if url and _is_valid_image_url(url):
+    # Everything we look for sits near the top; don't scan megabytes of script
+    html = html[:MAX_HTML_SIZE]
+    # Cheap substring checks first, so pages without a tag skip its regexes
+    html_lower = html.lower()
+    # Meta tags belong in <head>, so steps 1-2 look there first. Found in html
+    # itself: lower() can change the length of some non-ASCII text, so an
+    # offset into html_lower needn't line up with html.
+    head_match = _HEAD_END_TEXT_RE.search(html)
+    head_end = head_match.start() if head_match else len(html)
+
+    # 1-2. Open Graph image (most reliable for product pages), else Twitter card
+    if "og:image" in html_lower or "twitter:image" in html_lower:
+        og, twitter = _meta_images(html, 0, head_end)
+        if og is None and head_end < len(html):
+            # Some pages put the tags in <body>, and the first "</head>" can
+            # sit inside an inline script; the rest of the page still counts
+            og, body_twitter = _meta_images(html, head_end, len(html))
+            twitter = twitter or body_twitter
+        url = og or twitter
+        if url:
             return _resolve_url(url, base_url)
 
-    # 2. Twitter card image
-    tw_match = re.search(
-        r'<meta[^>]+name\s*=\s*["\']twitter:image["\'][^>]+content\s*=\s*["\']([^"\']+)["\']',
-        html,
-        re.IGNORECASE,
-    )
-    if not tw_match:
-        tw_match = re.search(
-            r'<meta[^>]+content\s*=\s*["\']([^"\']+)["\'][^>]+name\s*=\s*["\']twitter:image["\']',
-            html,
-            re.IGNORECASE,
-        )
-    if tw_match:
-        url = tw_match.group(1).strip()
-        if url and _is_valid_image_url(url):
+    # 3. JSON-LD structured data image — parsed, then any inline "image" string
+    if "application/ld+json" in html_lower:
+        for block in _JSONLD_SCRIPT_RE.finditer(html):
+            try:
+                data = from_json(block.group(1))
+            except ValueError:
+                continue
+            url = _jsonld_image(data)
+            if url:
+                return _resolve_url(url, base_url)
+    if '"image"' in html:
+        jsonld_match = _JSONLD_IMAGE_RE.search(html)
+        if jsonld_match:
+            url = jsonld_match.group(1).strip()
+            if _is_valid_image_url(url):
+                return url
+
+    # 4. Large product images – look for img tags with product-related class/id
+    if "<img" in html_lower:
+        url = _product_img(html)
+        if url:
             return _resolve_url(url, base_url)
 
-    # 3. JSON-LD structured data image
-    jsonld_match = re.search(
-        r'"image"\s*:\s*"(https?://[^"]+)"',
-        html,
-    )
-    if jsonld_match:
-        url = jsonld_match.group(1).strip()
+    return None
+
+
+def _tag_attrs(tag: str) -> dict[str, str]:
+    return {name.lower(): dq or sq for name, dq, sq in _TAG_ATTR_RE.findall(tag)}
+
+
+def _meta_images(html: str, start: int, end: int) -> tuple[Optional[str], Optional[str]]:
+    """First (og:image, twitter:image) among the <meta> tags in html[start:end].
+
+    One pass, which stops at the first og:image.
+    """
+    twitter = None
+    for match in _META_TAG_RE.finditer(html, start, end):
+        tag = match.group()
+        tag_lower = tag.lower()
+        if "og:image" not in tag_lower and "twitter:image" not in tag_lower:
+            continue
+        attrs = _tag_attrs(tag)
+        kind = (attrs.get("property") or attrs.get("name") or "").lower()
+        url = attrs.get("content", "").strip()
+        if kind not in ("og:image", "twitter:image") or not _is_valid_image_url(url):
+            continue
+        if kind == "og:image":
+            return url, twitter
+        twitter = twitter or url
+    return None, twitter
+
+
+def _product_img(html: str) -> Optional[str]:
+    """src of the first <img> whose class or id marks it as the product shot."""
+    for match in _IMG_TAG_RE.finditer(html):
+        attrs = _tag_attrs(match.group())
+        hint = f"{attrs.get('class', '')} {attrs.get('id', '')}"
+        if not _PRODUCT_IMG_HINT_RE.search(hint):
+            continue
+        url = attrs.get("src", "").strip()
         if _is_valid_image_url(url):
             return url
+    return None
 
-    # 4. Large product images – look for img tags with product-related class/id
-    product_img = re.search(
-        r'<img[^>]+(?:class|id)\s*=\s*["\'][^"\']*(?:product|hero|main|primary|featured)[^"\']*["\'][^>]+src\s*=\s*["\']([^"\']+)["\']',
-        html,
-        re.IGNORECASE,
-    )
-    if not product_img:
-        product_img = re.search(
-            r'<img[^>]+src\s*=\s*["\']([^"\']+)["\'][^>]+(?:class|id)\s*=\s*["\'][^"\']*(?:product|hero|main|primary|featured)[^"\']*["\']',
-            html,
-            re.IGNORECASE,
-        )
-    if product_img:
-        url = product_img.group(1).strip()
-        if _is_valid_image_url(url):
-            return _resolve_url(url, base_url)
 
+def _jsonld_image(data) -> Optional[str]:
+    """First usable image URL in a parsed JSON-LD document.
+
+    ``image`` may be a URL, a list, or an ImageObject (``url``/``contentUrl``),
+    and the product is often nested (``@graph``, ``mainEntity``, ...).
+    """
+    if isinstance(data, list):
+        for entry in data:
+            url = _jsonld_image(entry)
+            if url:
+                return url
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    images = data.get("image")
+    for image in images if isinstance(images, list) else (images,):
+        if isinstance(image, dict):
+            image = image.get("url") or image.get("contentUrl")
+        if isinstance(image, str) and _is_valid_image_url(image.strip()):
+            return image.strip()
+
+    for key, value in data.items():
+        if key != "image" and isinstance(value, (dict, list)):
+            url = _jsonld_image(value)
+            if url:
+                return url
     return None
 
 
@@ -252,14 +441,7 @@ def _is_valid_image_url(url: str) -> bool:
     """Basic check that a URL looks like a real product image."""
     if not url or len(url) < 10:
         return False
-    # Skip tiny icons, tracking pixels, SVGs, data URIs
-    skip_patterns = [
-        "1x1", "pixel", "spacer", "blank", "tracking",
-        ".svg", ".gif", "data:image", "base64",
-        "logo", "icon", "favicon", "badge", "sprite",
-    ]
-    url_lower = url.lower()
-    return not any(p in url_lower for p in skip_patterns)
+    return _IMAGE_SKIP_RE.search(url.lower()) is None
 
 
 def _resolve_url(url: str, base_url: str) -> str:
@@ -273,63 +455,140 @@ def _resolve_url(url: str, base_url: str) -> str:
 
 async def scrape_product_image(source_url: str) -> Optional[str]:
     """Attempt to scrape a product image from the given URL."""
-    cache_key = f"scrape:{source_url}"
-    if cache_key in _cache:
-        return _cache[cache_key]
-
-    try:
-        client = _get_client()
-        resp = await client.get(source_url)
-        if resp.status_code != 200:
-            _cache[cache_key] = None
-            return None
+    cache_key = f"scrape:{_norm_url(source_url)}"
+    cached = _cache.get(cache_key, _MISS)
+    if cached is not _MISS:
+        return cached
+    host = urlsplit(source_url).hostname or ""
+    if _host_skipped(host):
+        return None
+    return await _lookup_once(cache_key, lambda: _scrape_page(source_url, host))
 
-        html = resp.text
-        image_url = _extract_image_from_html(html, str(resp.url))
-        _cache[cache_key] = image_url
-        return image_url
 
-    except Exception:
-        _cache[cache_key] = None
-        return None
+def _host_skipped(host: str) -> bool:
+    until = _host_skip_until.get(host)
+    if until is None:
+        return False
+    if until <= time.monotonic():
+        _host_skip_until.pop(host)
+        return False
+    return True
+
+
+def _record_host_result(host: str, found: bool) -> None:
+    """Track a host's run of pages without an image; too long a run skips it for a while."""
+    if found:
+        _host_misses.pop(host)
+        return
+    misses = _host_misses.get(host, 0) + 1
+    if misses >= HOST_MISS_LIMIT:
+        _host_misses.pop(host)
+        _host_skip_until.put(host, time.monotonic() + HOST_SKIP_SECONDS)
+    else:
+        _host_misses.put(host, misses)
+
+
+async def _scrape_page(source_url: str, host: str) -> Optional[str]:
+    async with _open(source_url) as resp:
+        if resp.status_code == 200:
+            image_url = await _page_image(resp)
+        elif resp.status_code in _BOT_WALL_STATUSES:
+            image_url = None
+        else:
+            return None  # e.g. a 404 for one page says nothing about the host
+    _record_host_result(host, image_url is not None)
+    return image_url
+
+
+async def _page_image(resp: httpx.Response) -> Optional[str]:
+    # Decide from the headers before downloading anything
+    content_type = resp.headers.get("content-type", "").lower()
+    if content_type.startswith("image/"):
+        # The source URL is the image itself
+        image_url = str(resp.url)
+        return image_url if _is_valid_image_url(image_url) else None
+    if content_type and "html" not in content_type:
+        return None  # PDF, JSON, etc. — nothing to extract
+    html = await _read_html(resp)
+    return _extract_image_from_html(html, str(resp.url))
+
+
+async def _read_html(resp: httpx.Response) -> str:
+    """Read an HTML body, up to MAX_HTML_SIZE bytes.
+
+    Stops as soon as the <head> has arrived with a usable og:image — the
+    top-priority source — so the rest of the page is never downloaded.
+    In that case only the head is decoded and returned; the extractor finds
+    the same image in it.
+    """
+    encoding = resp.encoding or "utf-8"
+    body = bytearray()
+    scan_from = 0
+    head_seen = False
+    async for chunk in resp.aiter_bytes():
+        body += chunk
+        if len(body) >= MAX_HTML_SIZE:
+            break
+        if not head_seen:
+            head_end = _HEAD_END_RE.search(body, scan_from)
+            # Re-scan a little of the previous chunk in case the tag was split
+            scan_from = max(0, len(body) - 8)
+            if head_end:
+                head_seen = True
+                head = body[:head_end.start()].decode(encoding, errors="replace")
+                og, _ = _meta_images(head, 0, len(head))
+                if og:
+                    return head
+    return body.decode(encoding, errors="replace")
 
 
 # ---------------------------------------------------------------------------
 # Strategy 3: Category-based fallback
 # ---------------------------------------------------------------------------
 
+# Product-name keywords tried when the category itself doesn't match
+_NAME_KEYWORD_FALLBACKS = (
+    ("jacket", _JACKET_IMAGES), ("coat", _JACKET_IMAGES), ("parka", _JACKET_IMAGES),
+    ("puffer", _JACKET_IMAGES), ("fleece", _JACKET_IMAGES), ("vest", _JACKET_IMAGES),
+    ("monitor", _MONITOR_IMAGES), ("display", _MONITOR_IMAGES), ("screen", _MONITOR_IMAGES),
+    ("headphone", _HEADPHONE_IMAGES), ("earbud", _HEADPHONE_IMAGES), ("airpod", _HEADPHONE_IMAGES),
+    ("laptop", _LAPTOP_IMAGES), ("macbook", _LAPTOP_IMAGES), ("chromebook", _LAPTOP_IMAGES),
+    ("notebook", _LAPTOP_IMAGES),
+    ("shoe", _SHOE_IMAGES), ("sneaker", _SHOE_IMAGES), ("runner", _SHOE_IMAGES),
+    ("boot", _SHOE_IMAGES),
+    ("luggage", _LUGGAGE_IMAGES), ("suitcase", _LUGGAGE_IMAGES), ("carry-on", _LUGGAGE_IMAGES),
+)
+
+
+@lru_cache(maxsize=256)
+def _category_images(cat_lower: str) -> Optional[tuple[str, ...]]:
+    """Fallback images for a lowercased category — direct, then partial match.
+
+    Memoized: result sets repeat the same few categories.
+    """
+    images = _CATEGORY_FALLBACKS.get(cat_lower)
+    if images:
+        return images
+    for key, imgs in _CATEGORY_FALLBACKS.items():
+        if key in cat_lower or cat_lower in key:
+            return imgs
+    return None
+
+
 def _get_category_fallback(category: str, product_name: str) -> str:
     """Return a deterministic fallback image URL based on category and product name.
 
     Always returns a valid URL — uses generic product images as last resort.
     """
     cat_lower = category.lower().strip()
-    name_lower = product_name.lower()
 
-    # 1. Direct category match
-    images = _CATEGORY_FALLBACKS.get(cat_lower)
-
-    # 2. Partial category match
-    if not images:
-        for key, imgs in _CATEGORY_FALLBACKS.items():
-            if key in cat_lower or cat_lower in key:
-                images = imgs
-                break
+    # 1-2. Direct or partial category match
+    images = _category_images(cat_lower)
 
     # 3. Keyword match against product name
     if not images:
-        keyword_map = {
-            "jacket": _JACKET_IMAGES, "coat": _JACKET_IMAGES, "parka": _JACKET_IMAGES,
-            "puffer": _JACKET_IMAGES, "fleece": _JACKET_IMAGES, "vest": _JACKET_IMAGES,
-            "monitor": _MONITOR_IMAGES, "display": _MONITOR_IMAGES, "screen": _MONITOR_IMAGES,
-            "headphone": _HEADPHONE_IMAGES, "earbud": _HEADPHONE_IMAGES, "airpod": _HEADPHONE_IMAGES,
-            "laptop": _LAPTOP_IMAGES, "macbook": _LAPTOP_IMAGES, "chromebook": _LAPTOP_IMAGES,
-            "notebook": _LAPTOP_IMAGES,
-            "shoe": _SHOE_IMAGES, "sneaker": _SHOE_IMAGES, "runner": _SHOE_IMAGES,
-            "boot": _SHOE_IMAGES,
-            "luggage": _LUGGAGE_IMAGES, "suitcase": _LUGGAGE_IMAGES, "carry-on": _LUGGAGE_IMAGES,
-        }
-        for kw, imgs in keyword_map.items():
+        name_lower = product_name.lower()
+        for kw, imgs in _NAME_KEYWORD_FALLBACKS:
             if kw in name_lower or kw in cat_lower:
                 images = imgs
                 break
@@ -338,8 +597,9 @@ def _get_category_fallback(category: str, product_name: str) -> str:
     if not images:
         images = _GENERIC_IMAGES
 
-    # Use hash of product name to pick a consistent image for the same product
-    index = hash(product_name) % len(images)
+    # A stable hash of the product name picks the same image for the same
+    # product across restarts (builtin hash() is salted per process)
+    index = zlib.crc32(product_name.encode()) % len(images)
     return images[index]
 
 
@@ -355,27 +615,47 @@ async def enrich_products_with_images(products: list) -> list:
       2. Scraping the source_url for og:image / meta tags
       3. Category-based fallback image
 
-    If all fail, the existing image_url is kept unchanged.
+    Products still being looked up after ENRICH_TIMEOUT seconds, or whose
+    lookup failed, get the category fallback so one slow host can't hold
+    up the whole response.
     """
     if not products:
         return products
 
     async def _enrich_one(product):
-        # 1. Search Bing Images for the product
-        query = f"{product.brand} {product.name} product photo"
-        searched = await _search_image_bing(query)
-        if searched:
-            product.image_url = searched
-            return
-
-        # 2. Try scraping the source URL
-        scraped = await scrape_product_image(product.source_url)
-        if scraped:
-            product.image_url = scraped
-            return
+        # The source page is fetched alongside the Bing search, so a Bing miss
+        # costs no extra round trip. Bing's result still wins when it has one;
+        # the scrape is then cancelled, fetch included, unless another search
+        # is waiting on the same page.
+        scrape_task = asyncio.create_task(scrape_product_image(product.source_url))
+        try:
+            # 1. Search Bing Images for the product
+            query = f"{product.brand} {product.name} product photo"
+            searched = await _search_image_bing(query)
+            if searched:
+                product.image_url = searched
+                return
+
+            # 2. Try scraping the source URL
+            scraped = await scrape_task
+            if scraped:
+                product.image_url = scraped
+                return
+        finally:
+            scrape_task.cancel()
 
         # 3. Use category-based fallback (always returns a valid URL)
         product.image_url = _get_category_fallback(product.category, product.name)
 
-    await asyncio.gather(*[_enrich_one(p) for p in products])
+    tasks = [asyncio.create_task(_enrich_one(p)) for p in products]
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=ENRICH_TIMEOUT)
+    finally:
+        # Also runs if our caller is cancelled (a client leaving the stream),
+        # so no lookup outlives the request holding fetch slots
+        for task in tasks:
+            task.cancel()
+    for product, task in zip(products, tasks):
+        if task in pending or task.exception() is not None:
+            product.image_url = _get_category_fallback(product.category, product.name)
     return products
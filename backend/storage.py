@@ -4,25 +4,231 @@ Shared in-memory storage for the application.
 All routers import state from here so they operate on the same data.
 """
 
+from collections import Counter, deque
 from datetime import datetime
-from typing import List
+from operator import itemgetter
+from typing import Deque, Dict, List, Optional
+
+from pydantic import TypeAdapter
 
 from models import UserProfile, PurchaseRecord, WatchlistItem
+from responses import encode_json
 
 
 # ── In-memory storage ────────────────────────────────────
+# Oldest purchases fall off once the history is full, bounding memory
+MAX_PURCHASE_HISTORY = 10_000
+
 user_profile = UserProfile()
-purchase_history: List[PurchaseRecord] = []
-watchlist: List[WatchlistItem] = []
-
-
-def update_watchlist_price(product_id: str, new_price: float):
-    """Update a watchlist item's price (called by background tracker)."""
-    for item in watchlist:
-        if item.product_id == product_id:
-            item.price_history.append({
-                "price": new_price,
-                "date": datetime.now().isoformat(),
-            })
-            item.price = new_price
-            break
+purchase_history: Deque[PurchaseRecord] = deque(maxlen=MAX_PURCHASE_HISTORY)
+# product_id -> item; insertion order is the order items were watched
+watchlist: Dict[str, WatchlistItem] = {}
+
+# Running spend totals in integer cents, kept in step with purchase_history by
+# add_purchase(). Integer sums stay exact however many purchases accumulate.
+_total_cents = 0
+_cents_by_category: dict[str, int] = {}
+_purchases_by_category: Counter[str] = Counter()
+# (total, by_category) in dollars as served by /api/spending; dropped on change
+_spending_snapshot: Optional[tuple[float, dict[str, float]]] = None
+
+
+# JSON-encoded bodies served by the list and profile endpoints. Encoded
+# straight from the models on first read and dropped on any mutation, so repeated reads skip
+# both model_dump and response encoding.
+_purchases_json: Optional[bytes] = None
+_user_profile_json: Optional[bytes] = None
+_watchlist_json: Optional[bytes] = None
+
+# Serializers for the list bodies, built once from the model schemas
+_PURCHASES_ADAPTER = TypeAdapter(List[PurchaseRecord])
+_WATCHLIST_ADAPTER = TypeAdapter(List[WatchlistItem])
+
+# Immutable snapshots handed to the background loops; rebuilt only after an
+# insert or delete, so a tick doesn't copy the whole collection.
+_purchases_snapshot: Optional[tuple[PurchaseRecord, ...]] = None
+_watchlist_snapshot: Optional[tuple[WatchlistItem, ...]] = None
+
+# Bumped on every watchlist change so derived views can tell they're stale
+watchlist_version = 0
+# (watchlist_version, encoded body) of the last /price-drops result. Prices
+# only move when the tracker ticks, so most polls are served from here.
+_price_drops_cache: Optional[tuple[int, bytes]] = None
+
+
+def purchases_json() -> bytes:
+    global _purchases_json
+    if _purchases_json is None:
+        _purchases_json = _PURCHASES_ADAPTER.dump_json(list(purchase_history))
+    return _purchases_json
+
+
+def watchlist_json() -> bytes:
+    global _watchlist_json
+    if _watchlist_json is None:
+        _watchlist_json = _WATCHLIST_ADAPTER.dump_json(list(watchlist.values()))
+    return _watchlist_json
+
+
+def set_user_profile(profile: UserProfile):
+    global user_profile, _user_profile_json
+    user_profile = profile
+    _user_profile_json = None
+
+
+def user_profile_json() -> bytes:
+    """The stored profile, JSON-encoded once per update."""
+    global _user_profile_json
+    if _user_profile_json is None:
+        _user_profile_json = user_profile.model_dump_json().encode()
+    return _user_profile_json
+
+
+def purchases_snapshot() -> tuple[PurchaseRecord, ...]:
+    global _purchases_snapshot
+    if _purchases_snapshot is None:
+        _purchases_snapshot = tuple(purchase_history)
+    return _purchases_snapshot
+
+
+def watchlist_snapshot() -> tuple[WatchlistItem, ...]:
+    global _watchlist_snapshot
+    if _watchlist_snapshot is None:
+        _watchlist_snapshot = tuple(watchlist.values())
+    return _watchlist_snapshot
+
+
+def invalidate_purchases():
+    """Call after changing a stored purchase in place."""
+    global _purchases_json
+    _purchases_json = None
+
+
+def invalidate_watchlist():
+    """Call after changing a watchlist item in place."""
+    global _watchlist_json, watchlist_version
+    _watchlist_json = None
+    watchlist_version += 1
+
+
+def to_cents(price: float) -> int:
+    return round(price * 100)
+
+
+def add_purchase(record: PurchaseRecord):
+    """Append a purchase and fold its price into the running totals."""
+    global _total_cents, _spending_snapshot, _purchases_snapshot
+    if len(purchase_history) == purchase_history.maxlen:
+        _drop_from_totals(purchase_history[0])
+    purchase_history.append(record)
+    _purchases_snapshot = None
+    invalidate_purchases()
+    cents = to_cents(record.price)
+    _total_cents += cents
+    _cents_by_category[record.category] = _cents_by_category.get(record.category, 0) + cents
+    _purchases_by_category[record.category] += 1
+    _spending_snapshot = None
+
+
+def _drop_from_totals(record: PurchaseRecord):
+    """Take a purchase that is about to be evicted back out of the totals."""
+    global _total_cents
+    cents = to_cents(record.price)
+    _total_cents -= cents
+    _purchases_by_category[record.category] -= 1
+    if _purchases_by_category[record.category]:
+        _cents_by_category[record.category] -= cents
+    else:
+        del _purchases_by_category[record.category]
+        del _cents_by_category[record.category]
+
+
+def spending_totals() -> tuple[float, dict[str, float]]:
+    """Total spent and per-category spend, in dollars."""
+    global _spending_snapshot
+    if _spending_snapshot is None:
+        _spending_snapshot = (
+            _total_cents / 100,
+            {k: v / 100 for k, v in _cents_by_category.items()},
+        )
+    return _spending_snapshot
+
+
+def add_watchlist_item(item: WatchlistItem):
+    """Watch a product; re-adding a product replaces it and moves it to the end."""
+    global _watchlist_snapshot
+    watchlist.pop(item.product_id, None)
+    watchlist[item.product_id] = item
+    _watchlist_snapshot = None
+    invalidate_watchlist()
+
+
+def remove_watchlist_item(product_id: str):
+    global _watchlist_snapshot
+    if watchlist.pop(product_id, None) is not None:
+        _watchlist_snapshot = None
+        invalidate_watchlist()
+
+
+def update_watchlist_price(product_id: str, new_price: float, ts: Optional[str] = None):
+    """Update a watchlist item's price (called by background tracker).
+
+    ``ts`` is the ISO timestamp to record; the tracker passes one per tick.
+    """
+    item = watchlist.get(product_id)
+    if item is None:
+        return
+    item.record_price(new_price, ts or datetime.now().isoformat())
+    invalidate_watchlist()
+
+
+def price_drops_json() -> bytes:
+    """The /price-drops body, recomputed only after the watchlist changes."""
+    global _price_drops_cache
+    version = watchlist_version
+    if _price_drops_cache is None or _price_drops_cache[0] != version:
+        _price_drops_cache = (version, encode_json(_compute_price_drops()))
+    return _price_drops_cache[1]
+
+
+def _compute_price_drops() -> dict:
+    drops = []
+    total_drop = 0
+    for item in watchlist.values():
+        previous = item.previous_price
+        current = item.current_price
+        if previous is None or current >= previous:
+            continue
+        original = item.original_price
+        target = item.target_price
+
+        drop_amt = previous - current
+        drop_pct = (drop_amt / previous) * 100 if previous > 0 else 0
+        total_savings = original - current if current < original else 0
+        hit_target = target is not None and current <= target
+        drop_amount = round(drop_amt, 2)
+        total_drop += drop_amount
+
+        drops.append({
+            "product_id": item.product_id,
+            "product_name": item.product_name,
+            "current_price": current,
+            "previous_price": previous,
+            "original_price": original,
+            "drop_amount": drop_amount,
+            "drop_percent": round(drop_pct, 1),
+            "total_savings": round(total_savings, 2),
+            "target_price": target,
+            "hit_target": hit_target,
+            "brand": item.brand,
+            "category": item.category,
+            "alert_level": "high" if drop_pct >= 15 or hit_target else "medium" if drop_pct >= 5 else "low",
+        })
+
+    drops.sort(key=itemgetter("drop_percent"), reverse=True)
+    return {
+        "drops": drops,
+        "total_potential_savings": round(total_drop, 2),
+        "items_with_drops": len(drops),
+        "watchlist_size": len(watchlist),
+    }
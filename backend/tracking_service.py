@@ -7,8 +7,12 @@ Stops tracking if user hasn't been active for 24 hours.
 
 import asyncio
 import random
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Callable, Optional
+from itertools import islice
+from typing import Callable, Deque, Optional
+
+from storage import to_cents
 
 # ── Configuration ────────────────────────────────────────
 INACTIVE_THRESHOLD = timedelta(hours=24)
@@ -18,8 +22,14 @@ PURCHASE_CHECK_INTERVAL = 30 * 60  # 30 minutes
 # ── State ────────────────────────────────────────────────
 last_active: datetime = datetime.now()
 tracking_running: bool = False
-tracking_log: list[dict] = []
-purchase_price_alerts: list[dict] = []
+TRACKING_LOG_SIZE = 100
+# Most recent entries only; the oldest drop off as new ones are appended
+tracking_log: Deque[dict] = deque(maxlen=TRACKING_LOG_SIZE)
+# product_id -> alert; insertion order is the order alerts were first raised
+purchase_price_alerts: dict[str, dict] = {}
+# Sum of "savings" over purchase_price_alerts in integer cents, kept in step
+# as alerts change; integers don't drift however long the process runs
+_alert_savings_cents = 0
 
 # Track current market prices for past purchases (product_id -> latest price)
 purchase_market_prices: dict[str, float] = {}
@@ -31,6 +41,14 @@ def update_activity():
     last_active = datetime.now()
 
 
+async def stamp_activity():
+    """Route dependency form of update_activity() for user-facing endpoints.
+
+    Async so FastAPI calls it inline rather than in the threadpool.
+    """
+    update_activity()
+
+
 def is_user_active() -> bool:
     """Check if user has been active within the threshold."""
     return (datetime.now() - last_active) < INACTIVE_THRESHOLD
@@ -53,10 +71,7 @@ def _simulate_price_check(current_price: float) -> float:
 
 def _log(entry: dict):
     """Append to tracking log, keep last 100 entries."""
-    global tracking_log
     tracking_log.append(entry)
-    if len(tracking_log) > 100:
-        tracking_log = tracking_log[-100:]
 
 
 async def watchlist_tracking_loop(
@@ -65,48 +80,55 @@ async def watchlist_tracking_loop(
 ):
     """Background loop checking watchlist prices every few minutes."""
     global tracking_running
-    while True:
-        await asyncio.sleep(WATCHLIST_CHECK_INTERVAL)
-        if not is_user_active():
-            tracking_running = False
-            _log({
-                "type": "watchlist_paused",
-                "reason": "User inactive for 24+ hours",
-                "timestamp": datetime.now().isoformat(),
-            })
-            continue
-
-        tracking_running = True
-        watchlist = get_watchlist()
-        for item in watchlist:
-            old_price = item.price
-            new_price = _simulate_price_check(old_price)
-            if new_price != old_price:
-                update_watchlist_price(item.product_id, new_price)
-                _log({
-                    "type": "watchlist_price_update",
-                    "product_id": item.product_id,
-                    "product_name": item.product_name,
-                    "old_price": old_price,
-                    "new_price": new_price,
-                    "change": round(new_price - old_price, 2),
-                    "timestamp": datetime.now().isoformat(),
-                })
-            else:
+    try:
+        while True:
+            await asyncio.sleep(WATCHLIST_CHECK_INTERVAL)
+            if not is_user_active():
+                tracking_running = False
                 _log({
-                    "type": "watchlist_checked",
-                    "product_id": item.product_id,
-                    "product_name": item.product_name,
-                    "price": old_price,
+                    "type": "watchlist_paused",
+                    "reason": "User inactive for 24+ hours",
                     "timestamp": datetime.now().isoformat(),
                 })
+                continue
+
+            tracking_running = True
+            watchlist = get_watchlist()
+            # One timestamp per tick, shared by every price update and log entry
+            now_iso = datetime.now().isoformat()
+            for item in watchlist:
+                old_price = item.price
+                new_price = _simulate_price_check(old_price)
+                if new_price != old_price:
+                    update_watchlist_price(item.product_id, new_price, now_iso)
+                    _log({
+                        "type": "watchlist_price_update",
+                        "product_id": item.product_id,
+                        "product_name": item.product_name,
+                        "old_price": old_price,
+                        "new_price": new_price,
+                        "change": round(new_price - old_price, 2),
+                        "timestamp": now_iso,
+                    })
+                else:
+                    _log({
+                        "type": "watchlist_checked",
+                        "product_id": item.product_id,
+                        "product_name": item.product_name,
+                        "price": old_price,
+                        "timestamp": now_iso,
+                    })
+    except asyncio.CancelledError:
+        # Shutdown — report tracking as stopped, then let the cancellation through
+        tracking_running = False
+        raise
 
 
 async def purchase_tracking_loop(
     get_purchases: Callable,
 ):
     """Background loop rechecking past purchase prices every 30 minutes."""
-    global purchase_price_alerts
+    global _alert_savings_cents
     while True:
         await asyncio.sleep(PURCHASE_CHECK_INTERVAL)
         if not is_user_active():
@@ -118,6 +140,7 @@ async def purchase_tracking_loop(
             continue
 
         purchases = get_purchases()
+        now_iso = datetime.now().isoformat()
         for purchase in purchases:
             pid = purchase.product_id
             # Initialize market price from purchase price if not tracked yet
@@ -136,14 +159,16 @@ async def purchase_tracking_loop(
                     "current_market_price": new_market,
                     "savings": drop_amt,
                     "drop_percent": drop_pct,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                 }
                 # Update or add alert
-                existing = next((a for a in purchase_price_alerts if a["product_id"] == pid), None)
+                existing = purchase_price_alerts.get(pid)
                 if existing:
+                    _alert_savings_cents += to_cents(drop_amt) - to_cents(existing["savings"])
                     existing.update(alert)
                 else:
-                    purchase_price_alerts.append(alert)
+                    _alert_savings_cents += to_cents(drop_amt)
+                    purchase_price_alerts[pid] = alert
 
                 _log({
                     "type": "purchase_price_drop",
@@ -152,7 +177,7 @@ async def purchase_tracking_loop(
                     "purchased_at": purchase.price,
                     "current_market_price": new_market,
                     "savings": drop_amt,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                 })
             else:
                 _log({
@@ -161,7 +186,7 @@ async def purchase_tracking_loop(
                     "product_name": purchase.product_name,
                     "purchased_at": purchase.price,
                     "current_market_price": new_market,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                 })
 
 
@@ -177,17 +202,24 @@ def get_tracking_status() -> dict:
         "hours_until_pause": round(time_left / 3600, 1) if active else 0,
         "watchlist_interval_minutes": WATCHLIST_CHECK_INTERVAL / 60,
         "purchase_interval_minutes": PURCHASE_CHECK_INTERVAL / 60,
-        "recent_activity": tracking_log[-20:] if tracking_log else [],
-        "purchase_alerts": purchase_price_alerts,
+        "recent_activity": list(islice(tracking_log, max(0, len(tracking_log) - 20), None)),
+        "purchase_alerts": get_purchase_alerts(),
     }
 
 
 def get_purchase_alerts() -> list[dict]:
     """Get price drop alerts for past purchases."""
-    return purchase_price_alerts
+    return list(purchase_price_alerts.values())
+
+
+def purchase_alert_savings() -> float:
+    """Total savings across the current purchase price alerts."""
+    return _alert_savings_cents / 100
 
 
 def clear_purchase_alert(product_id: str):
     """Dismiss a purchase price alert."""
-    global purchase_price_alerts
-    purchase_price_alerts = [a for a in purchase_price_alerts if a["product_id"] != product_id]
+    global _alert_savings_cents
+    alert = purchase_price_alerts.pop(product_id, None)
+    if alert is not None:
+        _alert_savings_cents -= to_cents(alert["savings"])
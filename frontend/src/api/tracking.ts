@@ -6,13 +6,11 @@ export async function fetchTrackingData(): Promise<{
   status: TrackingStatus;
   alerts: PurchaseAlert[];
 }> {
-  const [statusRes, alertsRes] = await Promise.all([
-    fetch(`${API_BASE}/tracking/status`).then((r) => r.json()),
-    fetch(`${API_BASE}/tracking/purchase-alerts`).then((r) => r.json()),
-  ]);
+  // One combined request instead of separate status + alerts polls
+  const summary = await fetch(`${API_BASE}/tracking/summary`).then((r) => r.json());
   return {
-    status: statusRes,
-    alerts: alertsRes.alerts || [],
+    status: summary.tracking,
+    alerts: summary.alerts?.alerts || [],
   };
 }
 